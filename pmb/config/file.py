@@ -1,13 +1,63 @@
 # Copyright 2023 Oliver Smith
 # SPDX-License-Identifier: GPL-3.0-or-later
 import configparser
+import io
 import os
+import stat
+import tempfile
+from collections.abc import Callable
 from pathlib import Path, PosixPath
+from typing import Any
 
 from pmb.core import Config
 from pmb.helpers import logging
 
 
+def _read_paths(value: str) -> list[Path] | str:
+    # An empty value is passed through, Config turns it into an empty list
+    if not value:
+        return value
+    return [Path(p) for p in value.split(",")]
+
+
+def _write_paths(value: list[Path]) -> str:
+    return ",".join(os.fspath(p) for p in value)
+
+
+def _read_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _converters(key: str) -> tuple[Callable[[str], Any], Callable[[Any], str]]:
+    """
+    Get the functions to read and write a [pmbootstrap] option, based on
+    the type of its default value.
+
+    :param key: name of the option
+    :returns: (reader, writer) tuple
+    """
+    default = getattr(Config, key)
+    # Convert strings to paths
+    if type(default) is PosixPath:
+        return Path, str
+    # Yeah this really sucks and there isn't a better way to do it without external
+    # libraries
+    if isinstance(default, list) and isinstance(default[0], PosixPath):
+        return _read_paths, _write_paths
+    if isinstance(default, bool):
+        return _read_bool, str
+    return str, str
+
+
+# Options of the [pmbootstrap] section with their (reader, writer) functions,
+# resolved once at import time instead of for every key on each load/save
+_FIELDS: list[tuple[str, Callable[[str], Any], Callable[[Any], str]]] = [
+    (key, *_converters(key))
+    for key in Config.keys()  # noqa: SIM118
+    if key != "providers" and not key.startswith("mirrors.")
+]
+
+
 def load(path: Path) -> Config:
     config = Config()
 
@@ -20,33 +70,19 @@ def load(path: Path) -> Config:
     if "providers" not in cfg:
         cfg["providers"] = {}
 
-    for key in Config.__dict__:
-        if key == "providers":
-            setattr(config, key, cfg["providers"])
-        if key == "mirrors" and key in cfg:
-            for subkey in Config.mirrors:
-                if subkey in cfg["mirrors"]:
-                    setattr(config, f"mirrors.{subkey}", cfg["mirrors"][subkey])
+    # providers is a ClassVar, mypy doesn't allow assigning it through the instance
+    setattr(config, "providers", cfg["providers"])  # noqa: B010
+    if "mirrors" in cfg:
+        mirrors = cfg["mirrors"]
+        for subkey in Config.mirrors:
+            if subkey in mirrors:
+                setattr(config, f"mirrors.{subkey}", mirrors[subkey])
+
+    pmbootstrap = cfg["pmbootstrap"]
+    for key, read, _ in _FIELDS:
         # default values won't be set in the config file
-        if key not in cfg["pmbootstrap"]:
-            continue
-        # Convert strings to paths
-        elif type(getattr(Config, key)) is PosixPath:
-            setattr(config, key, Path(cfg["pmbootstrap"][key]))
-        # Yeah this really sucks and there isn't a better way to do it without external
-        # libraries
-        elif isinstance(getattr(Config, key), list) and isinstance(
-            getattr(Config, key)[0], PosixPath
-        ):
-            value = cfg["pmbootstrap"][key]
-            if not value:
-                setattr(config, key, value)
-            else:
-                setattr(config, key, [Path(p) for p in value.split(",")])
-        elif isinstance(getattr(Config, key), bool):
-            setattr(config, key, cfg["pmbootstrap"][key].lower() == "true")
-        elif key in cfg["pmbootstrap"]:
-            setattr(config, key, cfg["pmbootstrap"][key])
+        if key in pmbootstrap:
+            setattr(config, key, read(pmbootstrap[key]))
 
     return config
 
@@ -64,30 +100,23 @@ def serialize(config: Config, skip_defaults: bool = True) -> configparser.Config
     cfg["providers"] = {}
     cfg["mirrors"] = {}
 
-    # .keys() flat maps dictionaries like config.mirrors with
-    # dotted notation
-    for key in Config.keys():  # noqa: SIM118
-        # If the default value hasn't changed then don't write out,
-        # this makes it possible to update the default, otherwise
-        # we wouldn't be able to tell if the user overwrote it.
+    # If the default value hasn't changed then don't write out,
+    # this makes it possible to update the default, otherwise
+    # we wouldn't be able to tell if the user overwrote it.
+    if not skip_defaults or Config.get_default("providers") != config.providers:
+        cfg["providers"] = config.providers
+
+    for subkey in sorted(Config.mirrors):
+        key = f"mirrors.{subkey}"
         if skip_defaults and Config.get_default(key) == getattr(config, key):
             continue
-        if key == "providers":
-            cfg["providers"] = config.providers
-        elif key.startswith("mirrors."):
-            key_ = key.split(".")[1]
-            cfg["mirrors"][key_] = getattr(config, key)
-        # Convert strings to paths
-        elif type(getattr(Config, key)) is PosixPath:
-            cfg["pmbootstrap"][key] = str(getattr(config, key))
-        elif isinstance(getattr(Config, key), list) and isinstance(
-            getattr(Config, key)[0], PosixPath
-        ):
-            cfg["pmbootstrap"][key] = ",".join(os.fspath(p) for p in getattr(config, key))
-        elif isinstance(getattr(Config, key), bool):
-            cfg["pmbootstrap"][key] = str(getattr(config, key))
-        else:
-            cfg["pmbootstrap"][key] = str(getattr(config, key))
+        cfg["mirrors"][subkey] = getattr(config, key)
+
+    for key, _, write in _FIELDS:
+        value = getattr(config, key)
+        if skip_defaults and Config.get_default(key) == value:
+            continue
+        cfg["pmbootstrap"][key] = write(value)
 
     return cfg
 
@@ -103,9 +132,48 @@ def save(output: Path, config: Config) -> None:
     """
     logging.debug(f"Save config: {output}")
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.touch(0o600, exist_ok=True)
 
     cfg = serialize(config)
 
-    with output.open("w") as handle:
-        cfg.write(handle)
+    write_atomic(output, to_string(cfg))
+
+
+def to_string(cfg: configparser.ConfigParser) -> str:
+    """Get the INI representation of a config, as it would be written to a file."""
+    buf = io.StringIO()
+    cfg.write(buf)
+    return buf.getvalue()
+
+
+def write_atomic(path: Path, content: str, mode: int = 0o666) -> None:
+    """
+    Write a file so that it is either fully written or not at all.
+
+    The content gets written to a temporary file in the same directory with
+    one buffered write, which is then renamed over the destination. If path
+    is a symlink, the file it points to gets replaced.
+
+    :param path: destination file
+    :param content: text to write
+    :param mode: permissions if the file gets created (the umask still
+                 applies), an existing file keeps its permissions
+    """
+    path = path.resolve()
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode &= ~umask
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", buffering=1 << 16) as handle:
+            handle.write(content)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -1027,7 +1027,7 @@ def frontend(args: PmbArgs) -> None:
     # Zap existing chroots
     if (
         work_exists
-        and len(list(Chroot.iter_patterns()))
+        and any(Chroot.glob())
         and pmb.helpers.cli.confirm("Zap existing chroots to apply configuration?", default=True)
     ):
         args.deviceinfo = deviceinfo
@@ -8,32 +8,48 @@ from pmb.meta import Cache
 from pmb.types import WithExtraRepos
 
 
+@Cache("ui", "with_extra_repos")
+def ui_systemd_options(
+    ui: str, with_extra_repos: WithExtraRepos = WithExtraRepos.DEFAULT
+) -> tuple[bool, bool]:
+    """
+    Check the systemd related options of an UI's APKBUILD in one go.
+
+    :returns: (never, systemd) tuple, for pmb:systemd-never and pmb:systemd
+    """
+    options = pmb.helpers.ui.check_options(
+        ui,
+        ["pmb:systemd-never", "pmb:systemd"],
+        with_extra_repos=with_extra_repos,
+        must_exist=False,
+    )
+    return options["pmb:systemd-never"], options["pmb:systemd"]
+
+
 @Cache()
-def is_systemd_selected(config: Config) -> bool:
+def systemd_status(config: Config) -> tuple[bool, str]:
+    """
+    Figure out whether systemd is selected, and why.
+
+    :returns: (selected, reason) tuple
+    """
     if "systemd" not in pmb.config.pmaports.read_config_repos():
-        return False
-    if pmb.helpers.ui.check_option(
-        config.ui, "pmb:systemd-never", with_extra_repos=WithExtraRepos.DISABLED, must_exist=False
-    ):
-        return False
+        return False, "not supported by pmaports branch"
+    never, systemd = ui_systemd_options(config.ui, WithExtraRepos.DISABLED)
+    if never:
+        return False, "not supported by selected UI"
     if config.systemd == SystemdConfig.ALWAYS:
-        return True
+        return True, "'always' selected in 'pmbootstrap init'"
     if config.systemd == SystemdConfig.NEVER:
-        return False
-    return pmb.helpers.ui.check_option(
-        config.ui, "pmb:systemd", with_extra_repos=WithExtraRepos.DISABLED, must_exist=False
-    )
+        return False, "'never' selected in 'pmbootstrap init'"
+    return systemd, "default for selected UI"
+
+
+@Cache()
+def is_systemd_selected(config: Config) -> bool:
+    return systemd_status(config)[0]
 
 
 def systemd_selected_str(config: Config) -> tuple[str, str]:
-    if "systemd" not in pmb.config.pmaports.read_config_repos():
-        return "no", "not supported by pmaports branch"
-    if pmb.helpers.ui.check_option(config.ui, "pmb:systemd-never", must_exist=False):
-        return "no", "not supported by selected UI"
-    if config.systemd == SystemdConfig.ALWAYS:
-        return "yes", "'always' selected in 'pmbootstrap init'"
-    if config.systemd == SystemdConfig.NEVER:
-        return "no", "'never' selected in 'pmbootstrap init'"
-    if pmb.helpers.ui.check_option(config.ui, "pmb:systemd", must_exist=False):
-        return "yes", "default for selected UI"
-    return "no", "default for selected UI"
+    selected, reason = systemd_status(config)
+    return "yes" if selected else "no", reason
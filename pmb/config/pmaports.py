@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 import configparser
 import os
+import shutil
 import sys
 from pathlib import Path
 from typing import Final
@@ -29,10 +30,26 @@ def clone(do_shallow: bool = False) -> None:
     pmb.helpers.git.clone("pmaports", do_shallow)
 
 
+def version_at_least(real: str, minimum: str) -> bool:
+    """
+    Check if a version is at least the given minimum version.
+
+    Plain dotted numbers like "3.10.1" are compared as tuples of integers,
+    other versions with the full Alpine version comparison. That includes
+    numbers with leading zeros like "3.09", which Alpine doesn't compare as
+    integers.
+    """
+    parts_real = real.split(".")
+    parts_min = minimum.split(".")
+    if all(p.isdecimal() and (p == "0" or p[0] != "0") for p in parts_real + parts_min):
+        return tuple(map(int, parts_real)) >= tuple(map(int, parts_min))
+    return pmb.parse.version.compare(real, minimum) >= 0
+
+
 def check_version_pmaports(real: str) -> None:
     # Compare versions
     min = pmb.config.pmaports_min_version
-    if pmb.parse.version.compare(real, min) >= 0:
+    if version_at_least(real, min):
         return
 
     # Outated error
@@ -50,7 +67,7 @@ def check_version_pmaports(real: str) -> None:
 def check_version_pmbootstrap(min_ver: str) -> None:
     # Compare versions
     real = pmb.__version__
-    if pmb.parse.version.compare(real, min_ver) >= 0:
+    if version_at_least(real, min_ver):
         return
 
     # Show versions
@@ -76,26 +93,55 @@ def check_version_pmbootstrap(min_ver: str) -> None:
     )
 
 
-@Cache()
-def read_config_repos() -> dict[str, configparser.SectionProxy]:
-    """Read the sections starting with "repo:" from pmaports.cfg."""
+# Parsed pmaports.cfg files by path, along with the (mtime, size) of the file
+# when it was parsed
+_parsed_cfgs: dict[Path, tuple[tuple[int, int], configparser.ConfigParser]] = {}
+
+
+def _parse_cfg(path: Path) -> configparser.ConfigParser | None:
+    """
+    Parse a pmaports.cfg file, or reuse the previous result if the file did
+    not change since then. The returned object is shared, don't modify it.
+
+    :returns: the parsed config, or None if the file does not exist
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _parsed_cfgs.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
     cfg = configparser.ConfigParser()
-    cfg.read(f"{pkgrepo_default_path()}/pmaports.cfg")
+    cfg.read(path)
+    _parsed_cfgs[path] = (stamp, cfg)
+    return cfg
 
-    ret = {}
-    for section in cfg:
-        if not section.startswith("repo:"):
-            continue
-        repo = section.split("repo:", 1)[1]
-        ret[repo] = cfg[section]
 
-    return ret
+@Cache()
+def read_config_repos() -> dict[str, dict[str, str]]:
+    """
+    Read the sections starting with "repo:" from pmaports.cfg.
+
+    The sections are copied into plain dicts, so lookups don't go through
+    configparser's interpolation on every access.
+    """
+    cfg = _parse_cfg(pkgrepo_default_path() / "pmaports.cfg")
+    if cfg is None:
+        return {}
+
+    return {
+        section.removeprefix("repo:"): dict(cfg[section])
+        for section in cfg.sections()
+        if section.startswith("repo:")
+    }
 
 
 @Cache("aports", "add_systemd_prefix")
-def read_config(
-    aports: Path | None = None, add_systemd_prefix: bool = True
-) -> configparser.SectionProxy:
+def read_config(aports: Path | None = None, add_systemd_prefix: bool = True) -> dict[str, str]:
     """
     Read and verify pmaports.cfg. If aports is not
     specified and systemd is enabled, the returned channel
@@ -111,21 +157,19 @@ def read_config(
     if "extra-repos" in aports.parts:
         aports = pkgrepo_relative_path(aports)[0]
 
-    # Migration message
-    if not os.path.exists(aports):
-        logging.error(f"ERROR: pmaports dir not found: {aports}")
-        logging.error("Did you run 'pmbootstrap init'?")
-        sys.exit(1)
-
     # Require the config
     path_cfg = aports / "pmaports.cfg"
-    if not os.path.exists(path_cfg):
+    cfg = _parse_cfg(path_cfg)
+    if cfg is None:
+        # Migration message
+        if not os.path.exists(aports):
+            logging.error(f"ERROR: pmaports dir not found: {aports}")
+            logging.error("Did you run 'pmbootstrap init'?")
+            sys.exit(1)
         raise RuntimeError(f"Invalid pmaports repository, could not find the config: {path_cfg}")
 
-    # Load the config
-    cfg = configparser.ConfigParser()
-    cfg.read(path_cfg)
-    ret = cfg["pmaports"]
+    # Load the config (copy it, as we modify the channel below)
+    ret = dict(cfg["pmaports"])
 
     # Version checks
     check_version_pmaports(ret["version"])
@@ -207,13 +251,17 @@ def switch_to_channel_branch(channel_new: str) -> bool:
     """
     aports = pkgrepo_default_path()
 
+    # Check current pmaports branch channel. Nothing to do if it is the
+    # requested one, unless it is edge (see master -> main rename below).
+    channel_current = read_config(aports)["channel"]
+    if channel_current == channel_new and channel_current != DEVELOPMENT_CHANNEL:
+        return False
+
     # list current and new branches/channels
     channels_cfg = pmb.helpers.git.parse_channels_cfg(aports)
     branch_new = channels_cfg["channels"][channel_new]["branch_pmaports"]
     branch_current = pmb.helpers.git.rev_parse(aports, extra_args=["--abbrev-ref"])
 
-    # Check current pmaports branch channel
-    channel_current = read_config(aports)["channel"]
     # If we are on edge and on master but edge calls for main
     if (
         channel_current == DEVELOPMENT_CHANNEL
@@ -247,7 +295,10 @@ def switch_to_channel_branch(channel_new: str) -> bool:
     # flag subsequent times without the repository ever ending up "deep cloned". As such, check for
     # the presence of the branch instead of whether the flag is True.
     if pmb.helpers.run.user(
-        ["git", "show-ref", "--quiet", "--branches", branch_new], aports, check=False
+        ["git", "rev-parse", "--verify", "--quiet", f"refs/heads/{branch_new}"],
+        aports,
+        RunOutputTypeDefault.NULL,
+        check=False,
     ):
         logging.info(f"Branch {branch_new} doesn't exist, attempting to fetch it")
 
@@ -270,7 +321,10 @@ def switch_to_channel_branch(channel_new: str) -> bool:
             f"{aports}"
         )
 
-    # Verify pmaports.cfg on new branch
+    # Verify pmaports.cfg on new branch. The cached result is from the old
+    # branch, so drop it first; this also makes later callers see the new
+    # channel without parsing the file again.
+    read_config.cache_clear()
     read_config()
     return True
 
@@ -281,10 +335,14 @@ def install_githooks() -> None:
     if not hooks_dir.exists():
         logging.info("No .githooks dir found")
         return
-    for h in os.listdir(hooks_dir):
-        src = os.path.join(hooks_dir, h)
-        # Use git default hooks dir so users can ignore our hooks
-        # if they dislike them by setting "core.hooksPath" git config
-        dst = aports / ".git/hooks" / h
-        if pmb.helpers.run.user(["cp", src, dst], check=False):
-            logging.warning(f"WARNING: Copying git hook failed: {dst}")
+    with os.scandir(hooks_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            # Use git default hooks dir so users can ignore our hooks
+            # if they dislike them by setting "core.hooksPath" git config
+            dst = aports / ".git/hooks" / entry.name
+            try:
+                shutil.copy(entry.path, dst)
+            except OSError:
+                logging.warning(f"WARNING: Copying git hook failed: {dst}")
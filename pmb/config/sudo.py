@@ -5,7 +5,6 @@ import shutil
 from functools import lru_cache
 
 
-@lru_cache
 def which_sudo() -> str | None:
     """
     Return a command required to run commands as root, if any.
@@ -13,12 +12,20 @@ def which_sudo() -> str | None:
     Find whether sudo, doas, or run0 is installed for commands that require root.
     Allows user to override preferred sudo with PMB_SUDO env variable.
     """
-    if os.getuid() == 0:
+    return _which_sudo(os.getuid(), os.getenv("PMB_SUDO"))
+
+
+@lru_cache
+def _which_sudo(uid: int, user_set_sudo: str | None) -> str | None:
+    """
+    Cached implementation of which_sudo(). The uid and PMB_SUDO are part of
+    the cache key, so changing them leads to a new lookup.
+    """
+    if uid == 0:
         return None
 
     supported_sudos = ["doas", "sudo", "run0"]
 
-    user_set_sudo = os.getenv("PMB_SUDO")
     if user_set_sudo is not None:
         if shutil.which(user_set_sudo) is None:
             raise RuntimeError(
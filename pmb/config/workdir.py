@@ -10,37 +10,150 @@ dir.
 import configparser
 import os
 import time
+from pathlib import Path
 from typing import overload
 
 import pmb.config
+import pmb.config.file
 import pmb.config.pmaports
 from pmb.core import Chroot, ChrootType
 from pmb.core.context import get_context
 from pmb.helpers import logging
 from pmb.helpers.exceptions import NonBugError
 
+# Last parsed or written workdir.cfg: (path, (mtime, size), sections)
+_cfg_cache: tuple[Path, tuple[int, int], dict[str, dict[str, str]]] | None = None
+
+
+def _read_cfg(path: Path) -> dict[str, dict[str, str]] | None:
+    """
+    Parse workdir.cfg, or reuse the previous result if the file did not
+    change since it was last read or written.
+
+    :returns: the sections as plain dicts, like
+              {"chroot-channels": {"native": "edge"}}, or None if the
+              file does not exist
+    """
+    global _cfg_cache
+
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _cfg_cache and _cfg_cache[0] == path and _cfg_cache[1] == stamp:
+        return _cfg_cache[2]
+
+    text = path.read_text()
+    cfg = _parse(text)
+    if cfg is None:
+        parser = configparser.ConfigParser()
+        parser.read_string(text, str(path))
+        cfg = {section: dict(parser[section]) for section in parser.sections()}
+    _cfg_cache = (path, stamp, cfg)
+    return cfg
+
+
+def _parse(text: str) -> dict[str, dict[str, str]] | None:
+    """
+    Parse the subset of the INI format that we write workdir.cfg in, which
+    is only "[section]" and "key = value" lines. This is a lot faster than
+    ConfigParser.
+
+    :returns: the sections as plain dicts, or None if the text uses any
+              other INI features (comments, continuation lines, ...) and
+              needs to be parsed with ConfigParser instead
+    """
+    cfg: dict[str, dict[str, str]] = {}
+    section: dict[str, str] | None = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if line[0] == "[" and stripped[-1] == "]":
+            section = cfg.setdefault(stripped[1:-1], {})
+            continue
+        key, sep, value = line.partition("=")
+        if section is None or not sep or line[0] in "#; \t" or ":" in key:
+            return None
+        # ConfigParser stores keys in lower case too
+        section[key.strip().lower()] = value.strip()
+    return cfg
+
+
+def _serialize(cfg: dict[str, dict[str, str]]) -> str:
+    """
+    Get the INI representation of workdir.cfg, in the same format as
+    ConfigParser.write() creates it. Keys and values are plain strings without
+    line breaks, so they can be written as they are.
+    """
+    buf = []
+    for section, items in cfg.items():
+        buf.append(f"[{section}]\n")
+        buf.extend(f"{key} = {value}\n" for key, value in items.items())
+        buf.append("\n")
+    return "".join(buf)
+
+
+def _write_cfg(path: Path, cfg: dict[str, dict[str, str]]) -> None:
+    """
+    Write workdir.cfg and remember the written config for _read_cfg(). The
+    file is left untouched if it already has the same content.
+    """
+    global _cfg_cache
+
+    _cfg_cache = None
+    content = _serialize(cfg)
+    try:
+        unchanged = path.read_text() == content
+    except FileNotFoundError:
+        unchanged = False
+    if not unchanged:
+        pmb.config.file.write_atomic(path, content)
+    st = os.stat(path)
+    _cfg_cache = (path, (st.st_mtime_ns, st.st_size), cfg)
+
+
+def _chroot_key(chroot: Chroot) -> str:
+    """
+    Get the key of a chroot in workdir.cfg. ConfigParser stored keys in lower
+    case, and _parse() reads them that way, so write and look them up in lower
+    case as well.
+    """
+    return str(chroot).lower()
+
 
 def chroot_save_init(suffix: Chroot) -> None:
     """Save the chroot initialization data in $WORK/workdir.cfg."""
     # Read existing cfg
-    cfg = configparser.ConfigParser()
     path = get_context().config.work / "workdir.cfg"
-    if os.path.isfile(path):
-        cfg.read(path)
+    cfg = _read_cfg(path)
+    if cfg is None:
+        cfg = {}
 
     # Create sections
     for key in ["chroot-init-dates", "chroot-channels"]:
-        if key not in cfg:
-            cfg[key] = {}
+        cfg.setdefault(key, {})
 
-    # Update sections
+    # Skip writing if the chroot was saved for this channel a moment ago
+    name = _chroot_key(suffix)
     channel = pmb.config.pmaports.read_config()["channel"]
-    cfg["chroot-channels"][str(suffix)] = channel
-    cfg["chroot-init-dates"][str(suffix)] = str(int(time.time()))
+    now = int(time.time())
+    date_saved = cfg["chroot-init-dates"].get(name, "")
+    if (
+        cfg["chroot-channels"].get(name) == channel
+        and date_saved.isdecimal()
+        and 0 <= now - int(date_saved) < 60
+    ):
+        return
+
+    # Update sections
+    cfg["chroot-channels"][name] = channel
+    cfg["chroot-init-dates"][name] = str(now)
 
     # Write back
-    with open(path, "w") as handle:
-        cfg.write(handle)
+    _write_cfg(path, cfg)
 
 
 @overload
@@ -64,26 +177,21 @@ def chroots_outdated(chroot: Chroot | None = None) -> bool | list[Chroot]:
     """
     # Skip if workdir.cfg doesn't exist
     path = get_context().config.work / "workdir.cfg"
-    if not os.path.exists(path):
-        return False if chroot else []
-
-    cfg = configparser.ConfigParser()
-    cfg.read(path)
+    cfg = _read_cfg(path)
     key = "chroot-init-dates"
-    if key not in cfg:
+    if cfg is None or key not in cfg:
         return False if chroot else []
 
-    outdated: list[Chroot] = []
     date_outdated = time.time() - pmb.config.chroot_outdated
-    for cfg_suffix in cfg[key]:
-        if chroot and cfg_suffix != str(chroot):
-            continue
-        date_init = int(cfg[key][cfg_suffix])
-        if date_init <= date_outdated:
-            if chroot:
-                return True
-            outdated.append(Chroot.from_str(cfg_suffix))
-    return False if chroot else outdated
+    if chroot:
+        date_init = cfg[key].get(_chroot_key(chroot))
+        return date_init is not None and int(date_init) <= date_outdated
+
+    return [
+        Chroot.from_str(cfg_suffix)
+        for cfg_suffix, date_init in cfg[key].items()
+        if int(date_init) <= date_outdated
+    ]
 
 
 def chroot_check_channel(chroot: Chroot) -> bool:
@@ -103,17 +211,14 @@ def chroot_check_channel(chroot: Chroot) -> bool:
         " auto_zap_misconfigured_chroots yes'."
     )
     msg_unknown = f"Could not figure out on which release channel the '{chroot}' chroot is."
-    if not os.path.exists(path):
-        raise RuntimeError(f"{msg_unknown} {msg_again}")
-
-    cfg = configparser.ConfigParser()
-    cfg.read(path)
+    cfg = _read_cfg(path)
     key = "chroot-channels"
-    if key not in cfg or str(chroot) not in cfg[key]:
+    name = _chroot_key(chroot)
+    if cfg is None or key not in cfg or name not in cfg[key]:
         raise RuntimeError(f"{msg_unknown} {msg_again}")
 
     channel = pmb.config.pmaports.read_config()["channel"]
-    channel_cfg = cfg[key][str(chroot)]
+    channel_cfg = cfg[key][name]
     msg = (
         f"Chroot '{chroot}' is for the '{channel_cfg}' channel,"
         f" but you are on the '{channel}' channel."
@@ -147,29 +252,33 @@ def clean() -> bool | None:
         False if config did not change
     """
     # Skip if workdir.cfg doesn't exist
-    path = get_context().config.work / "workdir.cfg"
-    if not os.path.exists(path):
+    work = get_context().config.work
+    path = work / "workdir.cfg"
+    cfg = _read_cfg(path)
+    if cfg is None:
         return None
 
-    # Read
-    cfg = configparser.ConfigParser()
-    cfg.read(path)
+    # List the work dir once instead of checking each chroot path
+    with os.scandir(work) as entries:
+        dirnames = {entry.name for entry in entries if entry.is_dir()}
 
-    # Remove entries for deleted chroots
+    # Remove entries for deleted chroots. Both sections usually list the same
+    # chroots, so remember which ones exist.
     changed = False
+    exists: dict[str, bool] = {}
     for key in ["chroot-init-dates", "chroot-channels"]:
         if key not in cfg:
             continue
         for suffix_str in cfg[key]:
-            suffix = Chroot.from_str(suffix_str)
-            if suffix.path.exists():
-                continue
+            if suffix_str not in exists:
+                exists[suffix_str] = Chroot.from_str(suffix_str).dirname in dirnames
+        kept = {k: v for k, v in cfg[key].items() if exists[k]}
+        if len(kept) != len(cfg[key]):
             changed = True
-            del cfg[key][suffix_str]
+            cfg[key] = kept
 
     # Write back
     if changed:
-        with path.open("w") as handle:
-            cfg.write(handle)
+        _write_cfg(path, cfg)
 
     return changed
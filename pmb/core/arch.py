@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import ctypes
 import enum
+import functools
 import platform
-from pathlib import Path, PosixPath, PurePosixPath
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple
 
 import pmb.config
 
@@ -16,6 +18,7 @@ _cached_native_arch: Arch
 PER_LINUX32 = 0x0008
 
 
+@functools.cache
 def cpu_is_32_bit_capable() -> bool:
     """
     Check whether the host CPU is capable of executing 32-bit binaries.
@@ -87,234 +90,267 @@ class Arch(enum.Enum):
             return Arch(arch)
         except ValueError as exception:
             raise ValueError(
-                f"Invalid architecture: '{arch}',"
-                " expected something like:"
-                f" {', '.join(sorted(str(a) for a in Arch.supported()))}"
+                f"Invalid architecture: '{arch}', expected something like: {_SUPPORTED_NAMES}"
             ) from exception
 
     @staticmethod
     def from_machine_type(machine_type: str) -> Arch:
-        match machine_type:
-            case "i686":
-                return Arch.x86
-            case "x86_64":
-                return Arch.x86_64
-            case "aarch64":
-                return Arch.aarch64
-            case "armv6l":
-                return Arch.armhf
-            case "armv7l" | "armv8l":
-                return Arch.armv7
-            case "ppc64le":
-                return Arch.ppc64le
-            case "loongarch64":
-                return Arch.loongarch64
-            case _:
-                raise ValueError(f"Unsupported machine type '{machine_type}'")
+        try:
+            return _MACHINE_TYPES[machine_type]
+        except KeyError as exception:
+            raise ValueError(f"Unsupported machine type '{machine_type}'") from exception
 
     @staticmethod
     def native() -> Arch:
         return _cached_native_arch
 
     def is_native(self) -> bool:
-        return self == Arch.native()
+        # Enum members are singletons, so comparing them by identity is
+        # enough (and cheaper than ==)
+        return self is _cached_native_arch
 
     @staticmethod
-    def supported() -> set[Arch]:
+    def supported() -> frozenset[Arch]:
         """
         Officially supported host/target architectures for postmarketOS. Only
         specify architectures supported by Alpine here. For cross-compiling,
         we need to generate the "musl-$ARCH" and "gcc-$ARCH" packages (use
         "pmbootstrap aportgen musl-armhf" etc.).
         """
-        return {
-            Arch.armhf,
-            Arch.armv7,
-            Arch.aarch64,
-            Arch.x86_64,
-            Arch.x86,
-            Arch.riscv64,
-            Arch.s390x,
-            Arch.ppc64le,
-            Arch.loongarch64,
-            Arch.native(),
-        }
+        return _SUPPORTED
 
     @staticmethod
-    def supported_binary() -> set[Arch]:
+    def supported_binary() -> frozenset[Arch]:
         """Officially supported architectures that have a binary repository"""
         pmaports_cfg = pmb.config.pmaports.read_config()
-        return {Arch.from_str(i) for i in pmaports_cfg["supported_arches"].split(",")}
+        return _arches_from_str(pmaports_cfg["supported_arches"])
 
     def kernel_dir(self) -> str:
         """
         Name of the architecture-specific directory in the Linux kernel
         (in arch/).
         """
-        match self:
-            case Arch.x86 | Arch.x86_64:
-                return "x86"
-            case Arch.armhf | Arch.armv7:
-                return "arm"
-            case Arch.aarch64:
-                return "arm64"
-            case Arch.riscv64:
-                return "riscv"
-            case Arch.ppc64le | Arch.ppc64 | Arch.ppc:
-                return "powerpc"
-            case Arch.s390x:
-                return "s390"
-            case Arch.loongarch64 | Arch.loongarch32 | Arch.loongarchx32:
-                return "loongarch"
-            case _:
-                return self.value
+        return _ARCH_INFO[self].kernel_dir
 
     def kernel_arch(self) -> str:
         """Value to use for ARCH= when building the Linux kernel."""
-        match self:
-            case Arch.x86:
-                return "i386"
-            case Arch.x86_64:
-                return "x86_64"
-            case _:
-                return self.kernel_dir()
+        return _ARCH_INFO[self].kernel_arch
 
     def qemu_user(self) -> str:
-        match self:
-            case Arch.x86:
-                return "i386"
-            case Arch.armhf | Arch.armv7:
-                return "arm"
-            case _:
-                return self.value
+        return _ARCH_INFO[self].qemu_user
 
     def qemu_system(self) -> str:
-        match self:
-            case Arch.ppc64le:
-                return "ppc64"
-            case _:
-                return self.qemu_user()
+        return _ARCH_INFO[self].qemu_system
 
     def alpine_triple(self) -> str:
         """Get the cross compiler triple for this architecture on Alpine."""
-        match self:
-            case Arch.aarch64:
-                return "aarch64-alpine-linux-musl"
-            case Arch.armel:
-                return "armv5-alpine-linux-musleabi"
-            case Arch.armhf:
-                return "armv6-alpine-linux-musleabihf"
-            case Arch.armv7:
-                return "armv7-alpine-linux-musleabihf"
-            case Arch.loongarch32:
-                return "loongarch32-alpine-linux-musl"
-            case Arch.loongarchx32:
-                return "loongarchx32-alpine-linux-musl"
-            case Arch.loongarch64:
-                return "loongarch64-alpine-linux-musl"
-            case Arch.mips:
-                return "mips-alpine-linux-musl"
-            case Arch.mips64:
-                return "mips64-alpine-linux-musl"
-            case Arch.mipsel:
-                return "mipsel-alpine-linux-musl"
-            case Arch.mips64el:
-                return "mips64el-alpine-linux-musl"
-            case Arch.ppc:
-                return "powerpc-alpine-linux-musl"
-            case Arch.ppc64:
-                return "powerpc64-alpine-linux-musl"
-            case Arch.ppc64le:
-                return "powerpc64le-alpine-linux-musl"
-            case Arch.riscv32:
-                return "riscv32-alpine-linux-musl"
-            case Arch.riscv64:
-                return "riscv64-alpine-linux-musl"
-            case Arch.s390x:
-                return "s390x-alpine-linux-musl"
-            case Arch.x86:
-                return "i586-alpine-linux-musl"
-            case Arch.x86_64:
-                return "x86_64-alpine-linux-musl"
-            case _:
-                raise ValueError(
-                    f"Can not map Alpine architecture '{self}' to the right hostspec value"
-                )
+        triple = _ARCH_INFO[self].alpine_triple
+        if triple is None:
+            raise ValueError(
+                f"Can not map Alpine architecture '{self}' to the right hostspec value"
+            )
+        return triple
 
     def go(self) -> str:
-        match self:
-            case Arch.armhf | Arch.armv7:
-                return "arm"
-            case Arch.aarch64:
-                return "arm64"
-            case Arch.riscv64 | Arch.ppc64le:
-                return str(self)
-            case Arch.x86:
-                return "386"
-            case Arch.x86_64:
-                return "amd64"
-            case Arch.loongarch64:
-                return "loong64"
-            case _:
-                raise ValueError(f"Can not map architecture '{self}' to Go arch")
+        go = _ARCH_INFO[self].go
+        if go is None:
+            raise ValueError(f"Can not map architecture '{self}' to Go arch")
+        return go
 
     def cpu_emulation_required(self) -> bool:
-        # Obvious case: host arch is target arch
-        if self == Arch.native():
-            return False
-
-        # Currently, the only case where CPU emulation isn't required for non-host
-        # architectures is where the CPU supports 32-bit execution
-        if not cpu_is_32_bit_capable():
-            return True
-
-        # Other cases: host arch on the left, target archs on the right
-        not_required = {
-            Arch.x86_64: [Arch.x86],
-            Arch.armv7: [Arch.armel, Arch.armhf],
-            Arch.aarch64: [Arch.armv7],
-            Arch.loongarch64: [Arch.loongarch32],
-        }
-
-        # Not all aarch64 CPUs that are 32-bit capable are configured for
-        # execution of ARMv6 binaries
-        if Arch.native() == Arch.aarch64 and cp15_barriers_supported():
-            not_required[Arch.aarch64].append(Arch.armhf)
-
-        return not (Arch.native() in not_required and self in not_required[Arch.native()])
+        return _cpu_emulation_required(self)
 
     def linux32_required(self) -> bool:
         # Currently, the only case where CPU emulation isn't required for non-host
         # architectures is where the CPU supports 32-bit execution
-        return self != Arch.native() and not self.cpu_emulation_required()
+        return self is not _cached_native_arch and not self.cpu_emulation_required()
 
     # Magic to let us use an arch as a Path element
     def __truediv__(self, other: object) -> Path:
-        if isinstance(other, (PosixPath, PurePosixPath)):
+        if isinstance(other, PurePosixPath):
             # Convert the other path to a relative path
             # FIXME: we should avoid creating absolute paths that we actually want
             # to make relative to the chroot...
             # if other.is_absolute():
             #   logging.warning("FIXME: absolute path made relative to Arch??")
-            other = other.relative_to("/") if other.is_absolute() else other
-            return Path(str(self)).joinpath(other)
+            return _PATHS[self].joinpath(str(other).lstrip("/"))
         if isinstance(other, str):
             # Let's us do Arch / "whatever.apk" and magically produce a path
             # maybe this is a pattern we should avoid, but it seems somewhat
             # sensible
-            return Path(str(self)).joinpath(other.strip("/"))
+            return _join_str(self, other)
 
         return NotImplemented
 
     def __rtruediv__(self, other: object) -> Path:
-        if isinstance(other, (PosixPath, PurePosixPath)):
+        if isinstance(other, PurePosixPath):
             # Important to produce a new Path object here, otherwise we
             # end up with one object getting shared around and modified
             # and lots of weird stuff happens.
-            return Path(other) / str(self)
+            return Path(other) / self.value
         # We don't support str / Arch since that is a weird pattern
 
         return NotImplemented
 
 
+# Relative paths for using an arch as a path element
+_PATHS = {arch: Path(arch.value) for arch in Arch}
+
+# Machine types as returned by uname -m
+_MACHINE_TYPES = {
+    "i686": Arch.x86,
+    "x86_64": Arch.x86_64,
+    "aarch64": Arch.aarch64,
+    "armv6l": Arch.armhf,
+    "armv7l": Arch.armv7,
+    "armv8l": Arch.armv7,
+    "ppc64le": Arch.ppc64le,
+    "loongarch64": Arch.loongarch64,
+}
+
+
+class _ArchInfo(NamedTuple):
+    kernel_dir: str
+    """Directory in the Linux kernel's arch/."""
+    kernel_arch: str
+    """ARCH= value for building the Linux kernel."""
+    qemu_user: str
+    """Suffix of the qemu-user binary."""
+    qemu_system: str
+    """Suffix of the qemu-system binary."""
+    alpine_triple: str | None
+    """Cross compiler triple on Alpine, if there is one."""
+    go: str | None
+    """GOARCH value, if Go supports the architecture."""
+
+
+# Looked up by the Arch methods above, one entry for every architecture
+_ARCH_INFO: dict[Arch, _ArchInfo] = {
+    Arch.x86: _ArchInfo("x86", "i386", "i386", "i386", "i586-alpine-linux-musl", "386"),
+    Arch.x86_64: _ArchInfo(
+        "x86", "x86_64", "x86_64", "x86_64", "x86_64-alpine-linux-musl", "amd64"
+    ),
+    Arch.armhf: _ArchInfo("arm", "arm", "arm", "arm", "armv6-alpine-linux-musleabihf", "arm"),
+    Arch.armv7: _ArchInfo("arm", "arm", "arm", "arm", "armv7-alpine-linux-musleabihf", "arm"),
+    Arch.aarch64: _ArchInfo(
+        "arm64", "arm64", "aarch64", "aarch64", "aarch64-alpine-linux-musl", "arm64"
+    ),
+    Arch.riscv64: _ArchInfo(
+        "riscv", "riscv", "riscv64", "riscv64", "riscv64-alpine-linux-musl", "riscv64"
+    ),
+    Arch.s390x: _ArchInfo("s390", "s390", "s390x", "s390x", "s390x-alpine-linux-musl", None),
+    Arch.ppc64le: _ArchInfo(
+        "powerpc", "powerpc", "ppc64le", "ppc64", "powerpc64le-alpine-linux-musl", "ppc64le"
+    ),
+    Arch.armel: _ArchInfo("armel", "armel", "armel", "armel", "armv5-alpine-linux-musleabi", None),
+    Arch.loongarch32: _ArchInfo(
+        "loongarch",
+        "loongarch",
+        "loongarch32",
+        "loongarch32",
+        "loongarch32-alpine-linux-musl",
+        None,
+    ),
+    Arch.loongarchx32: _ArchInfo(
+        "loongarch",
+        "loongarch",
+        "loongarchx32",
+        "loongarchx32",
+        "loongarchx32-alpine-linux-musl",
+        None,
+    ),
+    Arch.loongarch64: _ArchInfo(
+        "loongarch",
+        "loongarch",
+        "loongarch64",
+        "loongarch64",
+        "loongarch64-alpine-linux-musl",
+        "loong64",
+    ),
+    Arch.mips: _ArchInfo("mips", "mips", "mips", "mips", "mips-alpine-linux-musl", None),
+    Arch.mips64: _ArchInfo(
+        "mips64", "mips64", "mips64", "mips64", "mips64-alpine-linux-musl", None
+    ),
+    Arch.mipsel: _ArchInfo(
+        "mipsel", "mipsel", "mipsel", "mipsel", "mipsel-alpine-linux-musl", None
+    ),
+    Arch.mips64el: _ArchInfo(
+        "mips64el", "mips64el", "mips64el", "mips64el", "mips64el-alpine-linux-musl", None
+    ),
+    Arch.noarch: _ArchInfo("noarch", "noarch", "noarch", "noarch", None, None),
+    Arch.ppc: _ArchInfo("powerpc", "powerpc", "ppc", "ppc", "powerpc-alpine-linux-musl", None),
+    Arch.ppc64: _ArchInfo(
+        "powerpc", "powerpc", "ppc64", "ppc64", "powerpc64-alpine-linux-musl", None
+    ),
+    Arch.riscv32: _ArchInfo(
+        "riscv32", "riscv32", "riscv32", "riscv32", "riscv32-alpine-linux-musl", None
+    ),
+}
+
+
+# Host arch on the left, target archs that the host CPU can execute without
+# emulation (if it is 32-bit capable) on the right
+_EMULATION_NOT_REQUIRED: dict[Arch, frozenset[Arch]] = {
+    Arch.x86_64: frozenset({Arch.x86}),
+    Arch.armv7: frozenset({Arch.armel, Arch.armhf}),
+    Arch.aarch64: frozenset({Arch.armv7}),
+    Arch.loongarch64: frozenset({Arch.loongarch32}),
+}
+
+
+@functools.cache
+def _cpu_emulation_required(arch: Arch) -> bool:
+    # Obvious case: host arch is target arch
+    if arch is _cached_native_arch:
+        return False
+
+    # Currently, the only case where CPU emulation isn't required for non-host
+    # architectures is where the CPU supports 32-bit execution
+    if not cpu_is_32_bit_capable():
+        return True
+
+    if arch in _EMULATION_NOT_REQUIRED.get(_cached_native_arch, frozenset()):
+        return False
+
+    # Not all aarch64 CPUs that are 32-bit capable are configured for
+    # execution of ARMv6 binaries
+    if _cached_native_arch is Arch.aarch64 and arch is Arch.armhf:
+        return not cp15_barriers_supported()
+
+    return True
+
+
+@functools.lru_cache(maxsize=4096)
+def _join_str(arch: Arch, other: str) -> Path:
+    """
+    Cached implementation of arch / str, as the same relative paths (e.g. to
+    APKINDEX files) get built over and over. Path objects are immutable, so
+    they can be shared.
+    """
+    return _PATHS[arch].joinpath(other.strip("/"))
+
+
+@functools.cache
+def _arches_from_str(arches: str) -> frozenset[Arch]:
+    """Parse a comma separated list of architectures, like in pmaports.cfg."""
+    return frozenset(Arch.from_str(i) for i in arches.split(","))
+
+
 _cached_native_arch = Arch.from_machine_type(platform.machine())
+
+_SUPPORTED = frozenset(
+    {
+        Arch.armhf,
+        Arch.armv7,
+        Arch.aarch64,
+        Arch.x86_64,
+        Arch.x86,
+        Arch.riscv64,
+        Arch.s390x,
+        Arch.ppc64le,
+        Arch.loongarch64,
+        _cached_native_arch,
+    }
+)
+# For error messages
+_SUPPORTED_NAMES = ", ".join(sorted(a.value for a in _SUPPORTED))
@@ -4,8 +4,11 @@
 from __future__ import annotations
 
 import enum
+import functools
+import os
 from collections.abc import Generator
 from pathlib import Path, PosixPath, PurePosixPath
+from typing import ClassVar
 
 import pmb.config
 from pmb.core.arch import Arch
@@ -24,29 +27,60 @@ class ChrootType(enum.Enum):
         return self.name
 
 
+_CHROOT_TYPE_BY_VALUE = {t.value: t for t in ChrootType}
+
+
 class Chroot:
+    # Chroot objects are created a lot, don't give each one a __dict__
+    __slots__ = ("__arch", "__dirname", "__name", "__path", "__str", "__type")
+
     __type: ChrootType
     __name: str
+    # Known for native and buildroot chroots, the others get it from deviceinfo
+    __arch: Arch | None
+    __str: str
+    __dirname: str
+    # (work dir, path) of the last path lookup
+    __path: tuple[Path, Path] | None
+    # (type, name) pairs that passed __validate() already
+    __validated: ClassVar[set[tuple[ChrootType, str]]] = set()
 
     def __init__(self, suffix_type: ChrootType, name: str | Arch | None = "") -> None:
         # We use the native chroot as the buildroot when building for the host arch
-        if suffix_type == ChrootType.BUILDROOT and isinstance(name, Arch) and name.is_native():
+        if suffix_type is ChrootType.BUILDROOT and isinstance(name, Arch) and name.is_native():
             suffix_type = ChrootType.NATIVE
             name = ""
 
         self.__type = suffix_type
         self.__name = str(name or "")
+        self.__arch = None
+        if suffix_type is ChrootType.NATIVE:
+            self.__arch = Arch.native()
+        elif suffix_type is ChrootType.BUILDROOT:
+            self.__arch = name if isinstance(name, Arch) else Arch.from_str(self.__name)
 
         self.__validate()
 
+        # Chroots don't change after they have been created
+        if self.__name and self.__type is not ChrootType.IMAGE:
+            self.__str = f"{self.__type.value}_{self.__name}"
+        else:
+            self.__str = self.__type.value
+        self.__dirname = f"chroot_{self.__str}"
+        self.__path = None
+
     def __validate(self) -> None:
         """Ensures that this suffix follows the correct format."""
-        if self.__type not in ChrootType._member_map_.values():
+        key = (self.__type, self.__name)
+        if key in Chroot.__validated:
+            return
+
+        if not isinstance(self.__type, ChrootType):
             raise ValueError(f"Invalid chroot type: '{self.__type}'")
 
         # A buildroot suffix must have a name matching one of alpines
         # architectures.
-        if self.__type == ChrootType.BUILDROOT and self.arch not in Arch.supported():
+        if self.__type is ChrootType.BUILDROOT and self.__arch not in Arch.supported():
             raise ValueError(f"Invalid buildroot suffix: '{self.__name}'")
 
         # A rootfs or installer suffix must have a name matching a device.
@@ -55,29 +89,34 @@ class Chroot:
             pass
 
         # A native suffix must not have a name.
-        if self.__type == ChrootType.NATIVE and self.__name != "":
+        if self.__type is ChrootType.NATIVE and self.__name != "":
             raise ValueError(f"The native suffix can't have a name but got: '{self.__name}'")
 
-        if self.__type == ChrootType.IMAGE and not Path(self.__name).exists():
+        if self.__type is ChrootType.IMAGE and not Path(self.__name).exists():
             raise ValueError(f"Image file '{self.__name}' does not exist")
 
         # rootfs suffixes must have a valid device name
-        if self.__type == ChrootType.ROOTFS and (len(self.__name) < 3 or "-" not in self.__name):
+        if self.__type is ChrootType.ROOTFS and (len(self.__name) < 3 or "-" not in self.__name):
             raise ValueError(f"Invalid device name: '{self.__name}'")
 
+        # Image files may get deleted, so check them every time
+        if self.__type is not ChrootType.IMAGE:
+            Chroot.__validated.add(key)
+
     def __str__(self) -> str:
-        if len(self.__name) > 0 and self.type != ChrootType.IMAGE:
-            return f"{self.__type.value}_{self.__name}"
-        else:
-            return self.__type.value
+        return self.__str
 
     @property
     def dirname(self) -> str:
-        return f"chroot_{self}"
+        return self.__dirname
 
     @property
     def path(self) -> Path:
-        return Path(get_context().config.work, self.dirname)
+        # The work dir only changes in the testsuite, check it anyway
+        work = get_context().config.work
+        if self.__path is None or self.__path[0] is not work:
+            self.__path = (work, Path(work, self.__dirname))
+        return self.__path[1]
 
     def exists(self) -> bool:
         return (self / "bin/sh").is_symlink()
@@ -87,10 +126,8 @@ class Chroot:
 
     @property
     def arch(self) -> Arch:
-        if self.type == ChrootType.NATIVE:
-            return Arch.native()
-        if self.type == ChrootType.BUILDROOT:
-            return Arch.from_str(self.name)
+        if self.__arch is not None:
+            return self.__arch
         # FIXME: this is quite delicate as it will only be valid
         # for certain pmbootstrap commands... It was like this
         # before but it should be fixed.
@@ -104,7 +141,8 @@ class Chroot:
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, str):
-            return str(self) == other or self.path == Path(other) or self.name == other
+            # Compare the strings first, that's cheaper than building a Path
+            return other in (self.__str, self.__name) or self.path == Path(other)
 
         if isinstance(other, PosixPath):
             return self.path == other
@@ -112,10 +150,10 @@ class Chroot:
         if not isinstance(other, Chroot):
             return NotImplemented
 
-        return self.type == other.type and self.name == other.name
+        return self.__type is other.__type and self.__name == other.__name
 
     def __truediv__(self, other: object) -> Path:
-        if isinstance(other, (PosixPath, PurePosixPath)):
+        if isinstance(other, PurePosixPath):
             # Convert the other path to a relative path
             # FIXME: we should avoid creating absolute paths that we actually want
             # to make relative to the chroot...
@@ -127,7 +165,7 @@ class Chroot:
         return NotImplemented
 
     def __rtruediv__(self, other: object) -> Path:
-        if isinstance(other, (PosixPath, PurePosixPath)):
+        if isinstance(other, PurePosixPath):
             # Important to produce a new Path object here, otherwise we
             # end up with one object getting shared around and modified
             # and lots of weird stuff happens.
@@ -146,44 +184,81 @@ class Chroot:
     def name(self) -> str:
         return self.__name
 
+    # Chroot objects are immutable, so the factories below return the same
+    # object for repeated calls with the same arguments (except for image
+    # chroots from from_str(), see there)
     @staticmethod
+    @functools.cache
     def native() -> Chroot:
         return Chroot(ChrootType.NATIVE)
 
     @staticmethod
+    @functools.lru_cache(maxsize=64)
     def buildroot(arch: Arch) -> Chroot:
         return Chroot(ChrootType.BUILDROOT, arch)
 
     @staticmethod
+    @functools.lru_cache(maxsize=64)
     def rootfs(device: str) -> Chroot:
         return Chroot(ChrootType.ROOTFS, device)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def __cached(suffix_type: ChrootType, name: str) -> Chroot:
+        return Chroot(suffix_type, name)
+
     @staticmethod
     def from_str(s: str) -> Chroot:
         """Generate a Suffix from a suffix string like "buildroot_aarch64"."""
-        parts = s.split("_", 1)
-        stype = parts[0]
+        stype, sep, name = s.partition("_")
+
+        if not sep and stype == "native":
+            return Chroot.native()
 
-        if len(parts) == 2:
-            # Will error if stype isn't a valid ChrootType
-            # The name will be validated by the Chroot constructor
-            return Chroot(ChrootType(stype), parts[1])
+        suffix_type = _CHROOT_TYPE_BY_VALUE.get(stype)
+        if suffix_type is None:
+            raise ValueError(f"Invalid chroot type: '{stype}'")
 
-        # "native" is the only valid suffix type, the constructor(s)
-        # will validate that stype is "native"
-        return Chroot(ChrootType(stype))
+        # The constructor validates the name and rejects a missing one for
+        # everything but "native". Image files may get deleted, so image
+        # chroots are not reused.
+        if suffix_type is ChrootType.IMAGE:
+            return Chroot(suffix_type, name)
+        return Chroot.__cached(suffix_type, name)
 
     @staticmethod
     def iter_patterns() -> Generator[str, None, None]:
         """Generate suffix patterns for all valid suffix types"""
         for stype in ChrootType:
-            if stype == ChrootType.NATIVE:
+            if stype is ChrootType.NATIVE:
                 yield f"chroot_{stype.value}"
             else:
                 yield f"chroot_{stype.value}_*"
 
     @staticmethod
     def glob() -> Generator[Path, None, None]:
-        """Glob all initialized chroot directories"""
-        for pattern in Chroot.iter_patterns():
-            yield from Path(get_context().config.work).glob(pattern)
+        """
+        Glob all initialized chroot directories. This lists the work dir once
+        and yields the chroots in the same order as globbing each of
+        iter_patterns() would.
+        """
+        work = get_context().config.work
+        try:
+            with os.scandir(work) as entries:
+                names = [entry.name for entry in entries if entry.name.startswith("chroot_")]
+        except FileNotFoundError:
+            return
+
+        by_type: dict[ChrootType, list[str]] = {stype: [] for stype in ChrootType}
+        for name in names:
+            suffix = name.removeprefix("chroot_")
+            stype, sep, _ = suffix.partition("_")
+            suffix_type = _CHROOT_TYPE_BY_VALUE.get(stype)
+            if suffix == "native":
+                by_type[ChrootType.NATIVE].append(name)
+            elif sep and suffix_type is not None and suffix_type is not ChrootType.NATIVE:
+                by_type[suffix_type].append(name)
+
+        for stype_names in by_type.values():
+            for name in stype_names:
+                yield work / name
@@ -5,10 +5,11 @@ import enum
 import inspect
 import multiprocessing
 import os
-from copy import deepcopy
 from pathlib import Path
 from typing import Any, ClassVar, TypedDict
 
+_HOME = Path(os.path.expanduser("~"))
+
 
 class Mirrors(TypedDict):
     alpine_custom: str
@@ -29,7 +30,11 @@ class SystemdConfig(enum.Enum):
 
     @staticmethod
     def choices() -> list[str]:
-        return [e.value for e in SystemdConfig]
+        return list(_SYSTEMD_CHOICES)
+
+
+# Plain values in an enum class body would become members, so keep this here
+_SYSTEMD_CHOICES = tuple(e.value for e in SystemdConfig)
 
 
 class AutoZapConfig(enum.Enum):
@@ -41,17 +46,17 @@ class AutoZapConfig(enum.Enum):
         return self.value
 
     def enabled(self) -> bool:
-        return self != AutoZapConfig.NO
+        return self is not AutoZapConfig.NO
 
     def noisy(self) -> bool:
-        return self == AutoZapConfig.YES
+        return self is AutoZapConfig.YES
 
 
 class Config:
     # This is a class variable that gets treated as an instance variable. It's wrong, but since we
     # only ever have one config (for now?) it doesn't cause any issues. Would be good to fix though.
     aports: list[Path] = [  # noqa: RUF012
-        Path(os.path.expanduser("~") + "/.local/var/pmbootstrap/cache_git/pmaports")
+        _HOME / ".local/var/pmbootstrap/cache_git/pmaports"
     ]
     boot_size: int = 512
     build_default_device_arch: bool = False
@@ -83,23 +88,24 @@ class Config:
     ui: str = "console"
     ui_extras: bool = False
     user: str = "user"
-    work: Path = Path(os.path.expanduser("~") + "/.local/var/pmbootstrap")
+    work: Path = _HOME / ".local/var/pmbootstrap"
     # automatically zap chroots that are for the wrong channel
     auto_zap_misconfigured_chroots: AutoZapConfig = AutoZapConfig.NO
 
     providers: ClassVar[dict[str, str]] = {}
 
     def __init__(self) -> None:
-        # Make sure we aren't modifying the class defaults
-        for key in inspect.get_annotations(Config):
-            setattr(self, key, deepcopy(Config.get_default(key)))
+        # Make sure we aren't modifying the class defaults. Only lists and dicts
+        # are mutable, and their items are not, so a shallow copy is enough.
+        for key in _FIELDS:
+            default = Config.get_default(key)
+            if isinstance(default, (list, dict)):
+                default = default.copy()
+            setattr(self, key, default)
 
     @staticmethod
     def keys() -> list[str]:
-        keys = list(inspect.get_annotations(Config).keys())
-        keys.remove("mirrors")
-        keys += [f"mirrors.{k}" for k in inspect.get_annotations(Mirrors)]
-        return sorted(keys)
+        return list(_KEYS)
 
     @staticmethod
     def get_default(dotted_key: str) -> Any:
@@ -107,52 +113,71 @@ class Config:
         Get the default value for a config option, supporting
         nested dictionaries (e.g. "mirrors.alpine").
         """
-        keys = dotted_key.split(".")
-        if len(keys) == 1:
-            return getattr(Config, keys[0])
-        elif len(keys) == 2:
-            return getattr(Config, keys[0])[keys[1]]
-        else:
+        key, sep, subkey = dotted_key.partition(".")
+        if not sep:
+            return getattr(Config, key)
+        if "." in subkey:
             raise ValueError(f"Invalid dotted key: {dotted_key}")
+        return getattr(Config, key)[subkey]
 
     def __setattr__(self, key: str, value: Any) -> None:
         """
         Allow for setattr() to be used with a dotted key
         to set nested dictionaries (e.g. "mirrors.alpine").
         """
-        keys = key.split(".")
-        if len(keys) == 1:
-            type_ = type(getattr(Config, key))
-            try:
-                if type_ is bool and isinstance(value, str):
-                    if value.lower() in ["true", "false"]:
-                        super().__setattr__(key, value.lower() == "true")
-                    else:
-                        raise ValueError()
-                else:
-                    super().__setattr__(key, type_(value))
-            except ValueError as exception:
-                msg = f"Invalid value for '{key}': '{value}' "
-                if issubclass(type_, enum.Enum):
-                    valid = [x.value for x in type_]
-                    msg += f"(valid values: {', '.join(valid)})"
+        head, sep, subkey = key.partition(".")
+        if sep:
+            if "." in subkey:
+                raise ValueError(f"Invalid dotted key: {key}")
+            super().__getattribute__(head)[subkey] = value
+            return
+
+        type_ = _TYPES.get(key) or type(getattr(Config, key))
+        # Immutable values that already have the right type don't need to be
+        # converted, lists and dicts still get copied below
+        if type(value) is type_ and type_ is not list and type_ is not dict:
+            super().__setattr__(key, value)
+            return
+
+        try:
+            if type_ is bool and isinstance(value, str):
+                if value.lower() in ["true", "false"]:
+                    super().__setattr__(key, value.lower() == "true")
                 else:
-                    msg += f"(expected {type_}, got {type(value)})"
-                raise ValueError(msg) from exception
-        elif len(keys) == 2:
-            super().__getattribute__(keys[0])[keys[1]] = value
-        else:
-            raise ValueError(f"Invalid dotted key: {key}")
-
-    def __getattribute__(self, key: str) -> Any:
+                    raise ValueError()
+            else:
+                super().__setattr__(key, type_(value))
+        except ValueError as exception:
+            msg = f"Invalid value for '{key}': '{value}' "
+            if issubclass(type_, enum.Enum):
+                valid = [x.value for x in type_]
+                msg += f"(valid values: {', '.join(valid)})"
+            else:
+                msg += f"(expected {type_}, got {type(value)})"
+            raise ValueError(msg) from exception
+
+    def __getattr__(self, key: str) -> Any:
         """
         Allow for getattr() to be used with a dotted key
         to get nested dictionaries (e.g. "mirrors.alpine").
+
+        This is only called if the regular attribute lookup fails, so plain
+        attributes don't go through it.
         """
-        keys = key.split(".")
-        if len(keys) == 1:
-            return super().__getattribute__(key)
-        elif len(keys) == 2:
-            return super().__getattribute__(keys[0])[keys[1]]
-        else:
+        head, sep, subkey = key.partition(".")
+        if not sep:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'")
+        if "." in subkey:
             raise ValueError(f"Invalid dotted key: {key}")
+        return getattr(self, head)[subkey]
+
+
+# The fields of Config don't change, so only look them up once
+_FIELDS = tuple(inspect.get_annotations(Config))
+_TYPES = {key: type(getattr(Config, key)) for key in _FIELDS}
+_KEYS = tuple(
+    sorted(
+        [key for key in _FIELDS if key != "mirrors"]
+        + [f"mirrors.{key}" for key in inspect.get_annotations(Mirrors)]
+    )
+)
@@ -3,7 +3,7 @@
 
 """Global runtime context"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Literal, overload
@@ -25,13 +25,16 @@ class CommandTimeout:
     reason: TimeoutReason
 
 
+@dataclass(slots=True, eq=False)
 class Context:
+    config: Config
+    log: Path = field(init=False)
+
     details_to_stdout: bool = False
     quiet: bool = False
     command_timeout: CommandTimeout | None = None
     sudo_timer: bool = False
     force: bool = False
-    log: Path
 
     # assume yes to prompts
     assume_yes: bool = False
@@ -50,14 +53,11 @@ class Context:
     ccache: bool = True
     go_mod_cache: bool = False
 
-    config: Config
-
-    def __init__(self, config: Config) -> None:
-        self.log = config.work / "log.txt"
-        self.config = config
+    def __post_init__(self) -> None:
+        self.log = self.config.work / "log.txt"
 
 
-__context: Context
+_context: Context | None = None
 
 
 @overload
@@ -72,18 +72,19 @@ def get_context(allow_failure: bool = False) -> Context | None:
     """Get immutable global runtime context."""
     # We must defer this to first call to avoid
     # circular imports.
-    if "__context" not in globals():
+    context = _context
+    if context is None:
         if allow_failure:
             return None
         raise RuntimeError("Context not loaded yet")
-    return __context
+    return context
 
 
 def set_context(context: Context) -> None:
     """Set global runtime context."""
-    global __context
+    global _context
 
-    if "__context" in globals():
+    if _context is not None:
         raise RuntimeError("Context already loaded")
 
-    __context = context
+    _context = context
@@ -130,6 +130,7 @@ def pkgrepo_iter_package_dirs(
     seen: dict[str, list[str]] = {a: [] for a in pkgrepo_names(with_extra_repos)}
 
     for repo in pkgrepo_paths(with_extra_repos):
+        repo_name = pkgrepo_name(repo)
         for root, dirs, files in os.walk(repo, followlinks=True):
             # Skip hidden directories and common non-package directories
             dirs[:] = [d for d in dirs if not d.startswith(".")]
@@ -142,7 +143,7 @@ def pkgrepo_iter_package_dirs(
                     continue
 
                 pkg = pdir.name
-                if pkg in seen[pkgrepo_name(repo)]:
+                if pkg in seen[repo_name]:
                     raise RuntimeError(
                         f"Package {pkg} found in multiple aports "
                         "subfolders. Please put it only in one folder."
@@ -150,7 +151,7 @@ def pkgrepo_iter_package_dirs(
                 if pkg in [x for li in seen.values() for x in li]:
                     continue
 
-                seen[pkgrepo_name(repo)].append(pkg)
+                seen[repo_name].append(pkg)
                 yield pdir
 
                 # Don't traverse subdirectories of a package directory
@@ -15,13 +15,14 @@ def ismount(folder: Path) -> bool:
 
     Workaround for: https://bugs.python.org/issue29707
     """
-    folder = folder.resolve()
+    # Paths in /proc/mounts are normalized already, compare them as strings
+    folder_str = str(folder.resolve())
     with open("/proc/mounts") as handle:
         for line in handle:
-            words = line.split()
-            if len(words) >= 2 and Path(words[1]) == folder:
+            words = line.split(maxsplit=2)
+            if len(words) >= 2 and words[1] == folder_str:
                 return True
-            if words[0] == str(folder):
+            if words[0] == folder_str:
                 return True
     return False
 
@@ -48,13 +48,30 @@ def check_option(
 
     If must_exist is set to False, False will be returned if the UI doesn't exist.
     """
+    return check_options(ui, [option], must_exist, with_extra_repos)[option]
+
+
+def check_options(
+    ui: str,
+    options: list[str],
+    must_exist: bool = True,
+    with_extra_repos: WithExtraRepos = WithExtraRepos.DEFAULT,
+) -> dict[str, bool]:
+    """
+    Check multiple options at once, looking up the UI's APKBUILD only once.
+    See check_option() for details.
+
+    :returns: dict like {"pmb:systemd": True, "pmb:systemd-never": False}
+    """
     if ui == "none":
         # Users can select "none" as UI in "pmbootstrap init", which does not
         # have a UI package.
-        return False
+        return dict.fromkeys(options, False)
 
     pkgname = f"postmarketos-ui-{ui}"
     apkbuild = pmb.helpers.pmaports.get(
         pkgname, must_exist, subpackages=False, with_extra_repos=with_extra_repos
     )
-    return option in apkbuild["options"] if apkbuild is not None else False
+    if apkbuild is None:
+        return dict.fromkeys(options, False)
+    return {option: option in apkbuild["options"] for option in options}
@@ -1,9 +1,14 @@
 # Copyright 2024 Caleb Connolly
 # SPDX-License-Identifier: GPL-3.0-or-later
+import os
+import stat
 from pathlib import Path
 
+import pytest
+
 import pmb.config
-from pmb.core.config import SystemdConfig
+import pmb.config.file
+from pmb.core.config import Config, SystemdConfig
 
 """Test the config file serialization and deserialization."""
 
@@ -27,3 +32,35 @@ def test_load(config_file: Path) -> None:
     assert config.providers == {}
     assert config.mirrors["pmaports"]
     assert ".pytest_tmp" in config.work.parts
+
+
+def test_write_atomic_mode(tmp_path: Path) -> None:
+    """New files get the given mode minus the umask, existing ones keep theirs."""
+    path = tmp_path / "test.cfg"
+    umask = os.umask(0o022)
+    try:
+        pmb.config.file.write_atomic(path, "a", 0o666)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+        path.chmod(0o640)
+        pmb.config.file.write_atomic(path, "b", 0o666)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+        assert path.read_text() == "b"
+    finally:
+        os.umask(umask)
+
+
+def test_dotted_keys() -> None:
+    config = Config()
+    assert getattr(config, "mirrors.alpine") == Config.mirrors["alpine"]
+
+    setattr(config, "mirrors.alpine", "http://example.org/alpine/")
+    assert config.mirrors["alpine"] == "http://example.org/alpine/"
+    assert getattr(config, "mirrors.alpine") == "http://example.org/alpine/"
+
+    with pytest.raises(ValueError, match="Invalid dotted key"):
+        getattr(config, "mirrors.alpine.x")
+    with pytest.raises(ValueError, match="Invalid dotted key"):
+        setattr(config, "mirrors.alpine.x", "")
+    with pytest.raises(AttributeError):
+        _ = config.does_not_exist
@@ -0,0 +1,29 @@
+# Copyright 2026 pmbootstrap contributors
+# SPDX-License-Identifier: GPL-3.0-or-later
+import pytest
+
+import pmb.parse.version
+from pmb.config.pmaports import version_at_least
+
+
+@pytest.mark.parametrize(
+    "real, minimum",
+    [
+        ("7", "7"),
+        ("7", "7.0"),
+        ("10", "9"),
+        ("3.10.1", "3.9"),
+        ("3.9", "3.10.1"),
+        ("1.0", "1.0.0"),
+        ("3.10.1_rc1", "3.10.1"),
+        ("3.10.1", "3.10.1_rc1"),
+        ("3.09", "3.1"),
+        ("3.1", "3.09"),
+        ("3.0.01", "3.0.1"),
+        ("3.0.1", "3.0.01"),
+    ],
+)
+def test_version_at_least(real: str, minimum: str) -> None:
+    """The fast path must agree with the full version comparison."""
+    expected = pmb.parse.version.compare(real, minimum) >= 0
+    assert version_at_least(real, minimum) == expected
@@ -0,0 +1,25 @@
+# Copyright 2026 pmbootstrap contributors
+# SPDX-License-Identifier: GPL-3.0-or-later
+import os
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pmb.config.sudo import which_sudo
+
+
+def test_which_sudo_root(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(os, "getuid", lambda: 0)
+    assert which_sudo() is None
+
+
+def test_which_sudo_override(monkeypatch: MonkeyPatch) -> None:
+    """The result must follow PMB_SUDO without clearing any cache."""
+    monkeypatch.setattr(os, "getuid", lambda: 1000)
+
+    monkeypatch.setenv("PMB_SUDO", "sh")
+    assert which_sudo() == "sh"
+
+    monkeypatch.setenv("PMB_SUDO", "pmbootstrap-missing-sudo")
+    with pytest.raises(RuntimeError, match="PMB_SUDO"):
+        which_sudo()
@@ -0,0 +1,93 @@
+# Copyright 2026 pmbootstrap contributors
+# SPDX-License-Identifier: GPL-3.0-or-later
+import configparser
+import os
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+import pmb.config.file
+import pmb.config.pmaports
+import pmb.config.workdir
+from pmb.core.chroot import Chroot
+from pmb.core.context import get_context
+
+"""Test reading and cleaning up $WORK/workdir.cfg."""
+
+
+def test_workdir_cfg_missing(pmb_args: None) -> None:
+    assert pmb.config.workdir.chroots_outdated() == []
+    assert not pmb.config.workdir.chroots_outdated(Chroot.native())
+    assert pmb.config.workdir.clean() is None
+
+
+def test_workdir_cfg_clean_and_reread(pmb_args: None) -> None:
+    path = get_context().config.work / "workdir.cfg"
+    path.write_text("[chroot-init-dates]\nnative = 0\n\n[chroot-channels]\nnative = edge\n")
+
+    assert pmb.config.workdir.chroots_outdated() == [Chroot.native()]
+    assert pmb.config.workdir.chroots_outdated(Chroot.native())
+
+    # The native chroot doesn't exist, so clean() drops its entries and
+    # the readers must see the rewritten file
+    assert pmb.config.workdir.clean()
+    assert pmb.config.workdir.chroots_outdated() == []
+    assert not pmb.config.workdir.clean()
+
+    # Changes made to the file by someone else are picked up too
+    path.write_text("[chroot-init-dates]\nnative = 0\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert pmb.config.workdir.chroots_outdated(Chroot.native())
+
+
+def test_workdir_cfg_mixed_case(pmb_args: None, monkeypatch: MonkeyPatch) -> None:
+    """Chroots with upper case letters must be found after re-reading the file."""
+    monkeypatch.setattr(pmb.config.pmaports, "read_config", lambda: {"channel": "edge"})
+    path = get_context().config.work / "workdir.cfg"
+    chroot = Chroot.rootfs("Foo-Bar")
+
+    pmb.config.workdir.chroot_save_init(chroot)
+    assert "rootfs_foo-bar = " in path.read_text()
+    assert not pmb.config.workdir.chroot_check_channel(chroot)
+
+    # Read the file again, like the next pmbootstrap invocation would
+    pmb.config.workdir._cfg_cache = None
+    assert not pmb.config.workdir.chroot_check_channel(chroot)
+
+    path.write_text("[chroot-init-dates]\nrootfs_foo-bar = 0\n")
+    assert pmb.config.workdir.chroots_outdated(chroot)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "[chroot-init-dates]\nnative = 1700000000\n\n[chroot-channels]\nnative = edge\n\n",
+        "[chroot-channels]\nRootfs_qemu-amd64=v25.06 \n",
+        "[chroot-channels]\nnative = edge\n  continued\n",
+        "# comment\n[chroot-channels]\nnative = edge\n",
+        "[chroot-channels]\nnative: edge\n",
+    ],
+)
+def test_workdir_cfg_parse(text: str) -> None:
+    """The fast parser must either agree with ConfigParser or give up."""
+    parser = configparser.ConfigParser()
+    parser.read_string(text)
+    expected = {section: dict(parser[section]) for section in parser.sections()}
+
+    parsed = pmb.config.workdir._parse(text)
+    assert parsed is None or parsed == expected
+
+
+def test_workdir_cfg_serialize() -> None:
+    """The output must be the same as with ConfigParser.write()."""
+    cfg = {
+        "chroot-init-dates": {"native": "1700000000", "buildroot_aarch64": "1700000001"},
+        "chroot-channels": {"native": "edge", "rootfs_qemu-amd64": "v25.06"},
+    }
+    parser = configparser.ConfigParser()
+    parser.read_dict(cfg)
+
+    assert pmb.config.workdir._serialize(cfg) == pmb.config.file.to_string(parser)
+    assert pmb.config.workdir._serialize({}) == ""
@@ -2,7 +2,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import shutil
+import subprocess
 import tempfile
+from collections.abc import Generator
 from pathlib import Path
 
 import pytest
@@ -17,6 +19,7 @@ from pmb.helpers.args import init as init_args
 from pmb.types import PmbArgs
 
 _testdir = Path(__file__).parent / "data/tests"
+_config_template = (_testdir / "pmbootstrap_v3.cfg").read_text()
 
 
 # request can be specified using parameterize from test cases
@@ -37,10 +40,9 @@ def config_file(tmp_path_factory: TempPathFactory, request: FixtureRequest) -> P
 
     configs = {"default": f"aports = {workdir / 'cache_git' / 'pmaports'}", "no-repos": "aports = "}
 
-    file = _testdir / "pmbootstrap_v3.cfg"
     print(f"CONFIG: {out_file}")
     cfg = configs[flavour]
-    contents = file.read_text().format(workdir, cfg)
+    contents = _config_template.format(workdir, cfg)
 
     out_file.write_text(contents)
     return out_file
@@ -59,7 +61,7 @@ def device_package(config_file: Path) -> Path:
     return pkgdir
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="session")
 def find_required_programs() -> None:
     """Fixture to find required programs for pmbootstrap."""
     pmb.config.require_programs()
@@ -92,8 +94,8 @@ def logfile(tmp_path_factory: TempPathFactory) -> Path:
     return logfile
 
 
-@pytest.fixture(autouse=True)
-def setup_mock_ask(monkeypatch: MonkeyPatch) -> None:
+@pytest.fixture(autouse=True, scope="session")
+def setup_mock_ask() -> Generator[None, None, None]:
     """Common setup to mock cli.ask() to avoid reading from stdin"""
     import pmb.helpers.cli
 
@@ -107,7 +109,9 @@ def setup_mock_ask(monkeypatch: MonkeyPatch) -> None:
     ) -> str:
         return default
 
-    monkeypatch.setattr(pmb.helpers.cli, "ask", mock_ask)
+    with MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(pmb.helpers.cli, "ask", mock_ask)
+        yield
 
 
 # FIXME: get/set_context() is a bad hack :(
@@ -124,7 +128,7 @@ def mock_context(monkeypatch: MonkeyPatch) -> None:
 
     def mock_set_context(ctx: Context) -> None:
         print(f"mock_set_context({ctx})")
-        setattr(pmb.core.context, "__context", ctx)
+        pmb.core.context._context = ctx
 
     monkeypatch.setattr("pmb.core.context.set_context", mock_set_context)
 
@@ -167,21 +171,49 @@ def foreign_arch() -> Arch:
     return Arch.x86_64
 
 
+@pytest.fixture(scope="session")
+def pmaports_clone(tmp_path_factory: TempPathFactory) -> Path | None:
+    """
+    Fixture to mirror pmaports once per session, so the tests using the
+    pmaports fixture don't download it again. Returns None if cloning failed,
+    the pmaports fixture reports that (session fixtures are set up before
+    function fixtures that may skip the test).
+    """
+    from pmb.core import Config
+
+    # As an optimisation, we check the default workdir for pmaports
+    # and clone it from there if it exists. This saves a bunch of bandwidth
+    # and time, and works offline.
+    url = pmb.config.git_repos["pmaports"][0]
+    if Config.aports[-1].exists():
+        url = str(Config.aports[-1])
+
+    path = tmp_path_factory.mktemp("pmaports") / "pmaports.git"
+    proc = subprocess.run(
+        ["git", "clone", "--quiet", "--mirror", url, str(path)],
+        capture_output=True,
+        text=True,
+        stdin=subprocess.DEVNULL,
+        check=False,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr)
+        return None
+    return path
+
+
 @pytest.fixture
-def pmaports(pmb_args: None, monkeypatch: MonkeyPatch) -> None:
+def pmaports(pmb_args: None, pmaports_clone: Path | None, monkeypatch: MonkeyPatch) -> None:
     """Fixture to clone pmaports."""
-    from pmb.core import Config
     from pmb.core.context import get_context
 
+    assert pmaports_clone is not None, "Failed to clone pmaports"
     cfg = get_context().config
 
-    # As an optimisation, we check the default workdir for pmaports
-    # and clone it from there if it exists. This saves a bunch of bandwidth
-    # and time.
-    if Config.aports[-1].exists():
-        # Override the URL to the local path so we can later look up the
-        # remote by URL
-        pmb.config.git_repos["pmaports"] = [str(Config.aports[-1])]
+    # Clone from the mirror made for the whole session, it has the same
+    # branches as the repository it was cloned from. Override the URL to the
+    # local path so we can later look up the remote by URL
+    monkeypatch.setitem(pmb.config.git_repos, "pmaports", [str(pmaports_clone)])
 
     if not cfg.aports[-1].exists():
         pmb.helpers.git.clone("pmaports")
@@ -1,6 +1,8 @@
 # Copyright 2024 Caleb Connolly
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from pathlib import Path
+
 import pytest
 
 from pmb.core.arch import Arch
@@ -45,6 +47,10 @@ def test_valid_chroots(pmb_args: None, mock_devices_find_path: None) -> None:
     assert chroot.path == work / "chroot_rootfs_qemu-amd64"
     assert str(chroot) == "rootfs_qemu-amd64"
 
+    # "pmbootstrap qemu" uses an image chroot without a name to get the path
+    chroot = Chroot(ChrootType.IMAGE, "")
+    assert chroot.path == work / "chroot_image"
+
 
 # mypy: ignore-errors
 def test_invalid_chroots(pmb_args: None) -> None:
@@ -69,6 +75,40 @@ def test_invalid_chroots(pmb_args: None) -> None:
     assert str(excinfo.value) == "Invalid chroot type: '5'"
 
 
+def test_glob_chroots(pmb_args: None) -> None:
+    """Chroot.glob() must find the same paths as globbing iter_patterns()."""
+    work = get_context().config.work
+    for name in [
+        "chroot_native",
+        "chroot_native_aarch64",
+        "chroot_buildroot_aarch64",
+        "chroot_buildroot_x86_64",
+        "chroot_rootfs_qemu-amd64",
+        "chroot_rootfs_",
+        "chroot_installer_qemu-amd64",
+        "chroot_image_test",
+        "chroot_invalid_test",
+        "chroot_",
+        "cache_apk_aarch64",
+    ]:
+        (work / name).mkdir()
+
+    expected = [path for pattern in Chroot.iter_patterns() for path in work.glob(pattern)]
+    assert list(Chroot.glob()) == expected
+    assert len(expected) == 7
+
+
+def test_from_str_image(tmp_path: Path) -> None:
+    """Image chroots from Chroot.from_str() must be validated every time."""
+    image = tmp_path / "test.img"
+    image.touch()
+    assert Chroot.from_str(f"image_{image}").name == str(image)
+
+    image.unlink()
+    with pytest.raises(ValueError, match="does not exist"):
+        Chroot.from_str(f"image_{image}")
+
+
 @pytest.mark.xfail
 def test_untested_chroots() -> None:
     # IMAGE type is untested, name should be a valid path in this case